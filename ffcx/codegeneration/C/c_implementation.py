@@ -176,11 +176,21 @@ class CFormatter:
 
     def _build_initializer_lists(self, values):
         """Build initializer lists."""
+        if values.ndim == 0:
+            return "{}"
+        if values.dtype.kind in "biu" or values.dtype in (np.float64, np.complex128):
+            # Python scalars format much faster than NumPy scalars, so
+            # convert the whole array to nested lists in one go
+            values = values.tolist()
+        return self._format_initializer_lists(values)
+
+    def _format_initializer_lists(self, values):
+        """Format (nested) sequences of numbers as initializer lists."""
         arr = "{"
-        if len(values.shape) == 1:
+        if len(values) > 0 and isinstance(values[0], (list, np.ndarray)):
+            arr += ",\n  ".join(self._format_initializer_lists(v) for v in values)
+        else:
             arr += ", ".join(self._format_number(v) for v in values)
-        elif len(values.shape) > 1:
-            arr += ",\n  ".join(self._build_initializer_lists(v) for v in values)
         arr += "}"
         return arr
 
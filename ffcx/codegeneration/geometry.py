@@ -5,65 +5,54 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """Geometry."""
 
+import functools
+
 import basix
 import numpy as np
 
 import ffcx.codegeneration.lnodes as L
 
-
-def write_table(tablename, cellname):
-    """Write a table."""
-    if tablename == "facet_edge_vertices":
-        return facet_edge_vertices(tablename, cellname)
-    if tablename == "cell_facet_jacobian":
-        return cell_facet_jacobian(tablename, cellname)
-    if tablename == "reference_cell_volume":
-        return reference_cell_volume(tablename, cellname)
-    if tablename == "reference_facet_volume":
-        return reference_facet_volume(tablename, cellname)
-    if tablename == "reference_cell_edge_vectors":
-        return reference_cell_edge_vectors(tablename, cellname)
-    if tablename == "reference_facet_edge_vectors":
-        return reference_facet_edge_vectors(tablename, cellname)
-    if tablename == "reference_normals":
-        return reference_normals(tablename, cellname)
-    if tablename == "facet_orientation":
-        return facet_orientation(tablename, cellname)
-    raise ValueError(f"Unknown geometry table name: {tablename}")
+# Vertex pairs of the edges of the possible facets of 3D cells
+_triangle_edges = np.asarray(basix.topology(basix.CellType.triangle)[1], dtype=np.intp)
+_quadrilateral_edges = np.asarray(basix.topology(basix.CellType.quadrilateral)[1], dtype=np.intp)
+_triangle_edges.setflags(write=False)
+_quadrilateral_edges.setflags(write=False)
 
 
+@functools.cache
 def facet_edge_vertices(tablename, cellname):
     """Write facet edge vertices."""
     celltype = getattr(basix.CellType, cellname)
     topology = basix.topology(celltype)
-    triangle_edges = basix.topology(basix.CellType.triangle)[1]
-    quadrilateral_edges = basix.topology(basix.CellType.quadrilateral)[1]
 
     if len(topology) != 4:
         raise ValueError("Can only get facet edges for 3D cells.")
 
-    edge_vertices = []
-    for facet in topology[-2]:
-        if len(facet) == 3:
-            edge_vertices += [[[facet[i] for i in edge] for edge in triangle_edges]]
-        elif len(facet) == 4:
-            edge_vertices += [[[facet[i] for i in edge] for edge in quadrilateral_edges]]
-        else:
-            raise ValueError("Only triangular and quadrilateral faces supported.")
+    facets = topology[-2]
+    facet_sizes = set(len(facet) for facet in facets)
+    if not facet_sizes.issubset({3, 4}):
+        raise ValueError("Only triangular and quadrilateral faces supported.")
+    if len(facet_sizes) > 1:
+        raise ValueError("Facet edge vertices not supported for cells with mixed facet types.")
+    edges = _triangle_edges if facet_sizes == {3} else _quadrilateral_edges
 
-    out = np.array(edge_vertices, dtype=int)
+    out = np.asarray(facets, dtype=np.intp)[:, edges]
     symbol = L.Symbol(f"{cellname}_{tablename}", dtype=L.DataType.INT)
+    out.setflags(write=False)
     return L.ArrayDecl(symbol, values=out, const=True)
 
 
+@functools.cache
 def cell_facet_jacobian(tablename, cellname):
     """Write a reference facet jacobian."""
     celltype = getattr(basix.CellType, cellname)
-    out = basix.cell.facet_jacobians(celltype)
+    out = np.asarray(basix.cell.facet_jacobians(celltype), dtype=np.float64)
     symbol = L.Symbol(f"{cellname}_{tablename}", dtype=L.DataType.REAL)
+    out.setflags(write=False)
     return L.ArrayDecl(symbol, values=out, const=True)
 
 
+@functools.cache
 def reference_cell_volume(tablename, cellname):
     """Write a reference cell volume."""
     celltype = getattr(basix.CellType, cellname)
@@ -72,6 +61,7 @@ def reference_cell_volume(tablename, cellname):
     return L.VariableDecl(symbol, out)
 
 
+@functools.cache
 def reference_facet_volume(tablename, cellname):
     """Write a reference facet volume."""
     celltype = getattr(basix.CellType, cellname)
@@ -83,55 +73,94 @@ def reference_facet_volume(tablename, cellname):
     return L.VariableDecl(symbol, volumes[0])
 
 
+@functools.cache
 def reference_cell_edge_vectors(tablename, cellname):
     """Write reference edge vectors."""
     celltype = getattr(basix.CellType, cellname)
     topology = basix.topology(celltype)
     geometry = basix.geometry(celltype)
-    edge_vectors = [geometry[j] - geometry[i] for i, j in topology[1]]
-    out = np.array(edge_vectors)
+    edges = np.asarray(topology[1], dtype=np.intp)
+    out = geometry[edges[:, 1]] - geometry[edges[:, 0]]
     symbol = L.Symbol(f"{cellname}_{tablename}", dtype=L.DataType.REAL)
+    out.setflags(write=False)
     return L.ArrayDecl(symbol, values=out, const=True)
 
 
+@functools.cache
 def reference_facet_edge_vectors(tablename, cellname):
     """Write facet reference edge vectors."""
     celltype = getattr(basix.CellType, cellname)
     topology = basix.topology(celltype)
     geometry = basix.geometry(celltype)
-    triangle_edges = basix.topology(basix.CellType.triangle)[1]
-    quadrilateral_edges = basix.topology(basix.CellType.quadrilateral)[1]
 
     if len(topology) != 4:
         raise ValueError("Can only get facet edges for 3D cells.")
 
-    edge_vectors = []
-    for facet in topology[-2]:
+    facets = topology[-2]
+    facet_edges = []
+    for facet in facets:
         if len(facet) == 3:
-            edge_vectors += [geometry[facet[j]] - geometry[facet[i]] for i, j in triangle_edges]
+            facet_edges.append(_triangle_edges)
         elif len(facet) == 4:
-            edge_vectors += [
-                geometry[facet[j]] - geometry[facet[i]] for i, j in quadrilateral_edges
-            ]
+            facet_edges.append(_quadrilateral_edges)
         else:
             raise ValueError("Only triangular and quadrilateral faces supported.")
 
-    out = np.array(edge_vectors)
+    # Fill the edge vectors of each facet into a single output array
+    num_edges = sum(edges.shape[0] for edges in facet_edges)
+    out = np.empty((num_edges, geometry.shape[1]), dtype=geometry.dtype)
+    offset = 0
+    for facet, edges in zip(facets, facet_edges):
+        vertices = np.asarray(facet, dtype=np.intp)[edges]
+        out[offset : offset + edges.shape[0]] = geometry[vertices[:, 1]] - geometry[vertices[:, 0]]
+        offset += edges.shape[0]
     symbol = L.Symbol(f"{cellname}_{tablename}", dtype=L.DataType.REAL)
+    out.setflags(write=False)
     return L.ArrayDecl(symbol, values=out, const=True)
 
 
+@functools.cache
 def reference_normals(tablename, cellname):
     """Write reference facet normals."""
     celltype = getattr(basix.CellType, cellname)
-    out = basix.cell.facet_outward_normals(celltype)
+    out = np.asarray(basix.cell.facet_outward_normals(celltype), dtype=np.float64)
     symbol = L.Symbol(f"{cellname}_{tablename}", dtype=L.DataType.REAL)
+    out.setflags(write=False)
     return L.ArrayDecl(symbol, values=out, const=True)
 
 
+@functools.cache
 def facet_orientation(tablename, cellname):
     """Write facet orientations."""
     celltype = getattr(basix.CellType, cellname)
-    out = basix.cell.facet_orientations(celltype)
+    out = np.asarray(basix.cell.facet_orientations(celltype), dtype=np.int64)
     symbol = L.Symbol(f"{cellname}_{tablename}", dtype=L.DataType.REAL)
-    return L.ArrayDecl(symbol, values=np.asarray(out), const=True)
+    out.setflags(write=False)
+    return L.ArrayDecl(symbol, values=out, const=True)
+
+
+# Table writers, by geometry table name
+_table_writers = {
+    "facet_edge_vertices": facet_edge_vertices,
+    "cell_facet_jacobian": cell_facet_jacobian,
+    "reference_cell_volume": reference_cell_volume,
+    "reference_facet_volume": reference_facet_volume,
+    "reference_cell_edge_vectors": reference_cell_edge_vectors,
+    "reference_facet_edge_vectors": reference_facet_edge_vectors,
+    "reference_normals": reference_normals,
+    "facet_orientation": facet_orientation,
+}
+
+
+def write_table(tablename, cellname):
+    """Write a table.
+
+    The tables only depend on the table and cell names, so they are
+    cached and shared between all forms compiled by this process. Their
+    values are therefore read-only.
+    """
+    try:
+        writer = _table_writers[tablename]
+    except KeyError:
+        raise ValueError(f"Unknown geometry table name: {tablename}")
+    return writer(tablename, cellname)
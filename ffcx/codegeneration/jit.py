@@ -388,9 +388,8 @@ def _compile_objects(
     # Create a "status ready" file. If this fails, it is an error,
     # because it should not exist yet.
     # Copy the stdout verbose output of the build into the ready file
-    fd = open(ready_name, "x")
-    fd.write(s)
-    fd.close()
+    with open(ready_name, "x") as fd:
+        fd.write(s)
 
     # Copy back the original handlers (in case someone is logging into
     # root logger and has custom handlers)
@@ -5,6 +5,8 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """Finite element interface."""
 
+import functools
+
 import basix
 import basix.ufl
 import numpy as np
@@ -33,17 +35,27 @@ def create_quadrature(
         )
 
 
+@functools.cache
 def reference_cell_vertices(cellname: str) -> npt.NDArray[np.float64]:
     """Get the vertices of a reference cell."""
-    return np.asarray(basix.geometry(_CellType[cellname]))
+    vertices = np.asarray(basix.geometry(_CellType[cellname]))
+    # The cached array is shared between callers
+    vertices.setflags(write=False)
+    return vertices
+
+
+@functools.cache
+def _facet_topology(cellname: str) -> list[list[int]]:
+    """Get the vertices of each facet of a reference cell."""
+    return basix.topology(_CellType[cellname])[-2]
 
 
 def map_facet_points(
     points: npt.NDArray[np.float64], facet: int, cellname: str
 ) -> npt.NDArray[np.float64]:
     """Map points from a reference facet to a physical facet."""
-    geom = np.asarray(basix.geometry(_CellType[cellname]))
-    facet_vertices = [geom[i] for i in basix.topology(_CellType[cellname])[-2][facet]]
+    geom = reference_cell_vertices(cellname)
+    facet_vertices = [geom[i] for i in _facet_topology(cellname)[facet]]
     return np.asarray(
         [
             facet_vertices[0]
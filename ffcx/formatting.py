@@ -22,20 +22,28 @@ from ffcx.codegeneration.codegeneration import CodeBlocks
 
 logger = logging.getLogger("ffcx")
 
+_banner = 79 * "*"
+
 
 def format_code(code: CodeBlocks) -> tuple[str, str]:
     """Format given code in UFC format. Returns two strings with header and source file contents."""
-    logger.info(79 * "*")
-    logger.info("Compiler stage 5: Formatting code")
-    logger.info(79 * "*")
-
-    code_c = ""
-    code_h = ""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(_banner)
+        logger.info("Compiler stage 5: Formatting code")
+        logger.info(_banner)
+
+    # Collect the parts and join once, rather than growing the strings
+    # part by part
+    parts_h: list[str] = []
+    parts_c: list[str] = []
     for parts_code in code:
-        code_h += "".join([c[0] for c in parts_code])
-        code_c += "".join([c[1] for c in parts_code])
+        if not parts_code:
+            continue
+        declarations, implementations = zip(*parts_code)
+        parts_h.extend(declarations)
+        parts_c.extend(implementations)
 
-    return code_h, code_c
+    return "".join(parts_h), "".join(parts_c)
 
 
 def write_code(code_h: str, code_c: str, prefix: str, output_dir: str) -> None:
@@ -47,5 +55,7 @@ def write_code(code_h: str, code_c: str, prefix: str, output_dir: str) -> None:
 def _write_file(output: str, prefix: str, postfix: str, output_dir: str) -> None:
     """Write generated code to file."""
     filename = os.path.join(output_dir, prefix + postfix)
-    with open(filename, "w") as hfile:
-        hfile.write(output)
+    # Encode once and write the bytes in a single call, bypassing the
+    # chunked encoding of text mode
+    with open(filename, "wb") as hfile:
+        hfile.write(output.encode("utf-8"))
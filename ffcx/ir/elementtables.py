@@ -60,22 +60,42 @@ class UniqueTableReferenceT(typing.NamedTuple):
 
 def equal_tables(a, b, rtol=default_rtol, atol=default_atol):
     """Check if two tables are equal."""
-    a = np.asarray(a)
-    b = np.asarray(b)
     if a.shape != b.shape:
         return False
-    else:
-        return np.allclose(a, b, rtol=rtol, atol=atol)
+
+    # Reject large tables that differ on a sample of the values before
+    # comparing all of them
+    if a.size > 64:
+        step = a.size // 16
+        a_sample = a.flat[::step]
+        b_sample = b.flat[::step]
+        if np.any(np.abs(a_sample - b_sample) > atol + rtol * np.abs(b_sample)):
+            return False
+
+    return np.allclose(a, b, rtol=rtol, atol=atol)
+
+
+def table_value_key(table):
+    """Get a key for looking up tables with nearly the same values.
+
+    The values are rounded to single precision, which is well within the
+    tolerances used to compare tables, so the key can be used to find
+    candidates for equal_tables.
+    """
+    return table.shape, table.astype(np.float32).tobytes()
 
 
 def clamp_table_small_numbers(
     table, rtol=default_rtol, atol=default_atol, numbers=(-1.0, 0.0, 1.0)
 ):
     """Clamp almost 0,1,-1 values to integers. Returns new table."""
-    # Get shape of table and number of columns, defined as the last axis
-    table = np.asarray(table)
-    for n in numbers:
-        table[np.where(np.isclose(table, n, rtol=rtol, atol=atol))] = n
+    # Compare each value with the nearest integer only, rather than with
+    # each of the numbers in turn. Adding zero turns -0.0 into 0.0.
+    nearest = np.rint(table)
+    nearest += 0.0
+    mask = np.isin(nearest, numbers)
+    mask &= np.isclose(table, nearest, rtol=rtol, atol=atol)
+    np.copyto(table, nearest, where=mask)
     return table
 
 
@@ -89,11 +109,15 @@ def get_ffcx_table_values(
     derivative_counts,
     flat_component,
     codim,
+    out=None,
 ):
     """Extract values from FFCx element table.
 
     Returns a 3D numpy array with axes
     (entity number, quadrature point number, dof number)
+
+    If ``out`` is given, the values are written into it rather than into
+    a new array.
     """
     deriv_order = sum(derivative_counts)
 
@@ -131,10 +155,15 @@ def get_ffcx_table_values(
             points = element._points
             weights = element._weights
         else:
-            # Make quadrature rule and get points and weights
-            points, weights = create_quadrature_points_and_weights(
-                integral_type, cell, element.embedded_superdegree(), "default", [element]
+            # Make quadrature rule and get points and weights, which are
+            # given for each type of cell (or facet) integrated over
+            points, weights, _ = create_quadrature_points_and_weights(
+                integral_type, cell, element.embedded_superdegree, "default", [element]
             )
+            if len(points) != 1:
+                raise RuntimeError(f"Averages over {avg} not supported for {cell.cellname()}.")
+            (points,) = points.values()
+            (weights,) = weights.values()
 
     # Tabulate table of basis functions and derivatives in points for each entity
     tdim = cell.topological_dimension()
@@ -142,37 +171,37 @@ def get_ffcx_table_values(
     num_entities = cell.num_sub_entities(entity_dim)
 
     # Extract arrays for the right scalar component
-    component_tables = []
     component_element, offset, stride = element.get_component_element(flat_component)
 
-    for entity in range(num_entities):
-        if codim == 0:
-            entity_points = map_integral_points(points, integral_type, cell, entity)
-        elif codim == 1:
-            entity_points = points
-        else:
-            raise RuntimeError("Codimension > 1 isn't supported.")
-        tbl = component_element.tabulate(deriv_order, entity_points)
-        tbl = tbl[basix_index(derivative_counts)]
-        component_tables.append(tbl)
+    # Tabulate the points on all entities at once. For codim 1 the points
+    # are the same on all entities, so they are only tabulated once.
+    if codim == 0:
+        mapped_points = [
+            map_integral_points(points, integral_type, cell, entity)
+            for entity in range(num_entities)
+        ]
+        num_points = mapped_points[0].shape[0]
+        entity_points = np.concatenate(mapped_points)
+    elif codim == 1:
+        entity_points = points
+        num_points = points.shape[0]
+    else:
+        raise RuntimeError("Codimension > 1 isn't supported.")
+    tbl = component_element.tabulate(deriv_order, entity_points)
+    tbl = tbl[basix_index(derivative_counts)]
+    tbl = tbl.reshape(-1, num_points, tbl.shape[-1])
 
     if avg in ("cell", "facet"):
-        # Compute numeric integral of the each component table
-        wsum = sum(weights)
-        for entity, tbl in enumerate(component_tables):
-            num_dofs = tbl.shape[1]
-            tbl = np.dot(tbl, weights) / wsum
-            tbl = np.reshape(tbl, (1, num_dofs))
-            component_tables[entity] = tbl
-
-    # Loop over entities and fill table blockwise (each block = points x dofs)
-    # Reorder axes as (points, dofs) instead of (dofs, points)
-    assert len(component_tables) == num_entities
-    num_points, num_dofs = component_tables[0].shape
-    shape = (1, num_entities, num_points, num_dofs)
-    res = np.zeros(shape)
-    for entity in range(num_entities):
-        res[:, entity, :, :] = component_tables[entity]
+        # Average each component table over the points with the quadrature weights
+        tbl = np.average(tbl, axis=1, weights=weights)[:, np.newaxis, :]
+
+    # Fill table blockwise (each block = points x dofs) with axes
+    # (permutation, entity, point, dof)
+    if out is None:
+        res = np.empty((1, num_entities, *tbl.shape[1:]), dtype=np.float64)
+    else:
+        res = out
+    res[0] = tbl
 
     return {"array": res, "offset": offset, "stride": stride}
 
@@ -262,44 +291,57 @@ def get_modified_terminal_element(mt) -> typing.Optional[ModifiedTerminalElement
 
 def permute_quadrature_interval(points, reflections=0):
     """Permute quadrature points for an interval."""
-    output = points.copy()
-    for p in output:
-        assert len(p) < 2 or np.isclose(p[1], 0)
-        assert len(p) < 3 or np.isclose(p[2], 0)
+    output = np.array(points, dtype=np.float64)
+    assert np.allclose(output[:, 1:], 0)
     for _ in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [1 - p[0]]
+        output[:, 0] = 1 - output[:, 0]
     return output
 
 
 def permute_quadrature_triangle(points, reflections=0, rotations=0):
     """Permute quadrature points for a triangle."""
-    output = points.copy()
-    for p in output:
-        assert len(p) < 3 or np.isclose(p[2], 0)
+    output = np.array(points, dtype=np.float64)
+    assert np.allclose(output[:, 2:], 0)
     for _ in range(rotations):
-        for n, p in enumerate(output):
-            output[n] = [p[1], 1 - p[0] - p[1]]
+        output[:, 0], output[:, 1] = output[:, 1].copy(), 1 - output[:, 0] - output[:, 1]
     for _ in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [p[1], p[0]]
+        output[:, [0, 1]] = output[:, [1, 0]]
     return output
 
 
 def permute_quadrature_quadrilateral(points, reflections=0, rotations=0):
     """Permute quadrature points for a quadrilateral."""
-    output = points.copy()
-    for p in output:
-        assert len(p) < 3 or np.isclose(p[2], 0)
+    output = np.array(points, dtype=np.float64)
+    assert np.allclose(output[:, 2:], 0)
     for _ in range(rotations):
-        for n, p in enumerate(output):
-            output[n] = [p[1], 1 - p[0]]
+        output[:, 0], output[:, 1] = output[:, 1].copy(), 1 - output[:, 0]
     for _ in range(reflections):
-        for n, p in enumerate(output):
-            output[n] = [p[1], p[0]]
+        output[:, [0, 1]] = output[:, [1, 0]]
     return output
 
 
+def permute_quadrature_points(points, cellname):
+    """Get all permutations of the quadrature points on a facet of a cell.
+
+    Returns a list of the points for each reflection (and rotation) of
+    the facet, with the points in their original order first.
+    """
+    if cellname in ("triangle", "quadrilateral"):
+        return [permute_quadrature_interval(points, ref) for ref in range(2)]
+    elif cellname == "tetrahedron":
+        return [
+            permute_quadrature_triangle(points, ref, rot) for rot in range(3) for ref in range(2)
+        ]
+    elif cellname == "hexahedron":
+        return [
+            permute_quadrature_quadrilateral(points, ref, rot)
+            for rot in range(4)
+            for ref in range(2)
+        ]
+    else:
+        raise RuntimeError(f"Permutation of quadrature points not supported on {cellname} cells.")
+
+
 def build_optimized_tables(
     quadrature_rule: QuadratureRule,
     cell: ufl.Cell,
@@ -352,9 +394,24 @@ def build_optimized_tables(
 
     _existing_tables = existing_tables.copy()
 
-    all_tensor_factors: list[UniqueTableReferenceT] = []
+    # Index the existing tables by shape, as only tables of the same
+    # shape can be equal, and by value to find (nearly) identical tables
+    # directly
+    tables_by_shape: dict[tuple[int, ...], list[str]] = {}
+    tables_by_value: dict[tuple[tuple[int, ...], bytes], str] = {}
+    for table_name, table in _existing_tables.items():
+        tables_by_shape.setdefault(table.shape, []).append(table_name)
+        tables_by_value.setdefault(table_value_key(table), table_name)
+
+    # Tensor factors indexed by shape and by their exact (double
+    # precision) values
+    tensor_factors_by_shape: dict[tuple[int, ...], list[UniqueTableReferenceT]] = {}
+    tensor_factors_by_value: dict[tuple[tuple[int, ...], bytes], UniqueTableReferenceT] = {}
     tensor_n = 0
 
+    table_values: dict[tuple[typing.Any, ...], dict[str, typing.Any]] = {}
+    permuted_points: typing.Optional[list[npt.NDArray[np.float64]]] = None
+
     for mt in modified_terminals:
         res = analysis.get(mt)
         if not res:
@@ -369,27 +426,39 @@ def build_optimized_tables(
             quadrature_rule, element_number, avg, entity_type, local_derivatives, flat_component
         )
 
-        # FIXME - currently just recalculate the tables every time,
-        # only reusing them if they match numerically.
-        # It should be possible to reuse the cached tables by name, but
-        # the dofmap offset may differ due to restriction.
-
         tdim = cell.topological_dimension()
         codim = tdim - element.cell.topological_dimension()
         assert codim >= 0
         if codim > 1:
             raise RuntimeError("Codimension > 1 isn't supported.")
 
-        # Only permute quadrature rules for interior facets integrals and for
-        # the codim zero element in mixed-dimensional integrals. The latter is
-        # needed because a cell may see its sub-entities as being oriented
-        # differently to their global orientation
-        if integral_type == "interior_facet" or (is_mixed_dim and codim == 0):
-            if tdim == 1 or codim == 1:
-                # Do not add permutations if codim-1 as facets have already gotten a global
-                # orientation in DOLFINx
+        # The table values do not depend on e.g. the restriction of the
+        # modified terminal, so compute them once for each combination
+        # of element, averaging, derivatives and component. Tables are
+        # still only reused by name if they match numerically, as the
+        # dofmap offset may differ due to restriction.
+        key = (element_number, avg, local_derivatives, flat_component, codim)
+        cached_values = table_values.get(key)
+        if cached_values is not None:
+            t = cached_values
+        else:
+            # Only permute quadrature rules for interior facets integrals and for
+            # the codim zero element in mixed-dimensional integrals. The latter is
+            # needed because a cell may see its sub-entities as being oriented
+            # differently to their global orientation. Do not add permutations
+            # if codim-1 as facets have already gotten a global orientation in
+            # DOLFINx.
+            if (integral_type == "interior_facet" or (is_mixed_dim and codim == 0)) and not (
+                tdim == 1 or codim == 1
+            ):
+                if permuted_points is None:
+                    permuted_points = permute_quadrature_points(
+                        quadrature_rule.points, cell.cellname()
+                    )
+                # Write the tables for each permutation into one array,
+                # allocated from the shape of the first permutation
                 t = get_ffcx_table_values(
-                    quadrature_rule.points,
+                    permuted_points[0],
                     cell,
                     integral_type,
                     element,
@@ -399,82 +468,50 @@ def build_optimized_tables(
                     flat_component,
                     codim,
                 )
-            elif tdim == 2:
-                new_table = []
-                for ref in range(2):
-                    new_table.append(
-                        get_ffcx_table_values(
-                            permute_quadrature_interval(quadrature_rule.points, ref),
-                            cell,
-                            integral_type,
-                            element,
-                            avg,
-                            entity_type,
-                            local_derivatives,
-                            flat_component,
-                            codim,
-                        )
+                array = np.empty((len(permuted_points), *t["array"].shape[1:]), dtype=np.float64)
+                array[:1] = t["array"]
+                for perm in range(1, len(permuted_points)):
+                    get_ffcx_table_values(
+                        permuted_points[perm],
+                        cell,
+                        integral_type,
+                        element,
+                        avg,
+                        entity_type,
+                        local_derivatives,
+                        flat_component,
+                        codim,
+                        out=array[perm : perm + 1],
                     )
+                t["array"] = array
+            else:
+                t = get_ffcx_table_values(
+                    quadrature_rule.points,
+                    cell,
+                    integral_type,
+                    element,
+                    avg,
+                    entity_type,
+                    local_derivatives,
+                    flat_component,
+                    codim,
+                )
 
-                t = new_table[0]
-                t["array"] = np.vstack([td["array"] for td in new_table])
-            elif tdim == 3:
-                cell_type = cell.cellname()
-                if cell_type == "tetrahedron":
-                    new_table = []
-                    for rot in range(3):
-                        for ref in range(2):
-                            new_table.append(
-                                get_ffcx_table_values(
-                                    permute_quadrature_triangle(quadrature_rule.points, ref, rot),
-                                    cell,
-                                    integral_type,
-                                    element,
-                                    avg,
-                                    entity_type,
-                                    local_derivatives,
-                                    flat_component,
-                                    codim,
-                                )
-                            )
-                    t = new_table[0]
-                    t["array"] = np.vstack([td["array"] for td in new_table])
-                elif cell_type == "hexahedron":
-                    new_table = []
-                    for rot in range(4):
-                        for ref in range(2):
-                            new_table.append(
-                                get_ffcx_table_values(
-                                    permute_quadrature_quadrilateral(
-                                        quadrature_rule.points, ref, rot
-                                    ),
-                                    cell,
-                                    integral_type,
-                                    element,
-                                    avg,
-                                    entity_type,
-                                    local_derivatives,
-                                    flat_component,
-                                    codim,
-                                )
-                            )
-                    t = new_table[0]
-                    t["array"] = np.vstack([td["array"] for td in new_table])
-        else:
-            t = get_ffcx_table_values(
-                quadrature_rule.points,
-                cell,
-                integral_type,
-                element,
-                avg,
-                entity_type,
-                local_derivatives,
-                flat_component,
-                codim,
+            # Tables are compared and hashed by value below
+            assert t["array"].dtype == np.float64 and t["array"].flags.c_contiguous
+
+            # Clean up table and analyse its type once for all modified
+            # terminals sharing it. Values close to 0 and 1 are exact if
+            # clamped with at least the (default) tolerances used to
+            # analyse the table.
+            t["array"] = clamp_table_small_numbers(t["array"], rtol=rtol, atol=atol)
+            t["ttype"] = analyse_table_type(
+                t["array"], clamped=rtol >= default_rtol and atol >= default_atol
             )
-        # Clean up table
-        tbl = clamp_table_small_numbers(t["array"], rtol=rtol, atol=atol)
-        tabletype = analyse_table_type(tbl)
+            table_values[key] = t
+
+        tbl = t["array"]
+        tabletype = t["ttype"]
 
         if tabletype in piecewise_ttypes:
             # Reduce table to dimension 1 along num_points axis in generated code
@@ -487,9 +524,14 @@ def build_optimized_tables(
             # Reduce table along num_perms axis
             tbl = tbl[:1, :, :, :]
 
-        # Check for existing identical table
+        # Check for existing identical table, trying a table with the same
+        # single precision values before the other tables of the same shape
+        value_key = table_value_key(tbl)
+        candidates = tables_by_shape.get(tbl.shape, [])
+        if value_key in tables_by_value:
+            candidates = [tables_by_value[value_key], *candidates]
         is_new_table = True
-        for table_name in _existing_tables:
+        for table_name in candidates:
             if equal_tables(tbl, _existing_tables[table_name]):
                 name = table_name
                 tbl = _existing_tables[name]
@@ -497,6 +539,9 @@ def build_optimized_tables(
                 break
 
         if is_new_table:
+            if name not in _existing_tables or _existing_tables[name].shape != tbl.shape:
+                tables_by_shape.setdefault(tbl.shape, []).append(name)
+            tables_by_value.setdefault(value_key, name)
             _existing_tables[name] = tbl
 
         cell_offset = 0
@@ -520,10 +565,12 @@ def build_optimized_tables(
                 d = local_derivatives[i]
                 sub_tbl = j.tabulate(d, pts)[d]
                 sub_tbl = sub_tbl.reshape(1, 1, sub_tbl.shape[0], sub_tbl.shape[1])
-                for tensor_factor in all_tensor_factors:
-                    if tensor_factor.values.shape == sub_tbl.shape and np.allclose(
-                        tensor_factor.values, sub_tbl
-                    ):
+                factor_key = (sub_tbl.shape, sub_tbl.tobytes())
+                factor_candidates = tensor_factors_by_shape.get(sub_tbl.shape, [])
+                if factor_key in tensor_factors_by_value:
+                    factor_candidates = [tensor_factors_by_value[factor_key]]
+                for tensor_factor in factor_candidates:
+                    if np.allclose(tensor_factor.values, sub_tbl):
                         tensor_factors.append(tensor_factor)
                         break
                 else:
@@ -540,7 +587,8 @@ def build_optimized_tables(
                         None,
                         None,
                     )
-                    all_tensor_factors.append(ut)
+                    tensor_factors_by_shape.setdefault(sub_tbl.shape, []).append(ut)
+                    tensor_factors_by_value[factor_key] = ut
                     tensor_factors.append(ut)
                     mt_tables[ut.name] = ut
                     tensor_n += 1
@@ -572,60 +620,58 @@ def build_optimized_tables(
     return mt_tables
 
 
-def is_zeros_table(table, rtol=default_rtol, atol=default_atol):
+def is_zeros_table(table, rtol=default_rtol, atol=default_atol, exact=False):
     """Check if table values are all zero."""
-    return np.prod(table.shape) == 0 or np.allclose(
-        table, np.zeros(table.shape), rtol=rtol, atol=atol
-    )
+    if exact:
+        return not table.any()
+    return table.size == 0 or np.allclose(table, 0.0, rtol=rtol, atol=atol)
 
 
-def is_ones_table(table, rtol=default_rtol, atol=default_atol):
+def is_ones_table(table, rtol=default_rtol, atol=default_atol, exact=False):
     """Check if table values are all one."""
-    return np.allclose(table, np.ones(table.shape), rtol=rtol, atol=atol)
+    if exact:
+        return bool((table == 1.0).all())
+    return np.allclose(table, 1.0, rtol=rtol, atol=atol)
 
 
-def is_quadrature_table(table, rtol=default_rtol, atol=default_atol):
+def is_quadrature_table(table, rtol=default_rtol, atol=default_atol, exact=False):
     """Check if table is a quadrature table."""
-    _, num_entities, num_points, num_dofs = table.shape
+    _, _, num_points, num_dofs = table.shape
     Id = np.eye(num_points)
-    return num_points == num_dofs and all(
-        np.allclose(table[0, i, :, :], Id, rtol=rtol, atol=atol) for i in range(num_entities)
-    )
+    if exact:
+        return num_points == num_dofs and bool((table[0] == Id).all())
+    return num_points == num_dofs and np.allclose(table[0], Id, rtol=rtol, atol=atol)
 
 
 def is_permuted_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table is permuted."""
-    return not all(
-        np.allclose(table[0, :, :, :], table[i, :, :, :], rtol=rtol, atol=atol)
-        for i in range(1, table.shape[0])
-    )
+    return not np.allclose(table[:1], table, rtol=rtol, atol=atol)
 
 
 def is_piecewise_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table is piecewise."""
-    return all(
-        np.allclose(table[0, :, 0, :], table[0, :, i, :], rtol=rtol, atol=atol)
-        for i in range(1, table.shape[2])
-    )
+    return np.allclose(table[0, :, :1, :], table[0], rtol=rtol, atol=atol)
 
 
 def is_uniform_table(table, rtol=default_rtol, atol=default_atol):
     """Check if table is uniform."""
-    return all(
-        np.allclose(table[0, 0, :, :], table[0, i, :, :], rtol=rtol, atol=atol)
-        for i in range(1, table.shape[1])
-    )
+    return np.allclose(table[0, :1], table[0], rtol=rtol, atol=atol)
 
 
-def analyse_table_type(table, rtol=default_rtol, atol=default_atol):
-    """Analyse table type."""
-    if is_zeros_table(table, rtol=rtol, atol=atol):
+def analyse_table_type(table, rtol=default_rtol, atol=default_atol, clamped=False):
+    """Analyse table type.
+
+    If ``clamped``, values of the table close to 0 and 1 have already been
+    clamped with at least the given tolerances, so these are compared
+    exactly.
+    """
+    if is_zeros_table(table, rtol=rtol, atol=atol, exact=clamped):
         # Table is empty or all values are 0.0
         ttype = "zeros"
-    elif is_ones_table(table, rtol=rtol, atol=atol):
+    elif is_ones_table(table, rtol=rtol, atol=atol, exact=clamped):
         # All values are 1.0
         ttype = "ones"
-    elif is_quadrature_table(table, rtol=rtol, atol=atol):
+    elif is_quadrature_table(table, rtol=rtol, atol=atol, exact=clamped):
         # Identity matrix mapping points to dofs (separately on each entity)
         ttype = "quadrature"
     else:
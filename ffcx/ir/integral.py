@@ -378,5 +378,10 @@ def replace_quadratureweight(expression):
         if is_modified_terminal(node) and isinstance(node, QuadratureWeight):
             r.append(node)
 
+    # Most integrands carry no quadrature weights; avoid rebuilding the
+    # expression tree when there is nothing to replace
+    if not r:
+        return expression
+
     replace_map = {q: 1.0 for q in r}
     return ufl.algorithms.replace(expression, replace_map)
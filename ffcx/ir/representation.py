@@ -181,11 +181,18 @@ def compute_ir(
                 fd.original_form, itg_data.integral_type, fd_index, itg_data.subdomain_id, prefix
             )
 
+    # Compute space dimensions of all unique elements once, rather than
+    # for each integral and expression
+    element_dimensions = {
+        element: element.dim + element.num_global_support_dofs
+        for element in analysis.unique_elements
+    }
+
     irs = [
         _compute_integral_ir(
             fd,
             i,
-            analysis.element_numbers,
+            element_dimensions,
             integral_names,
             options,
             visualise,
@@ -216,7 +223,7 @@ def compute_ir(
             expr,
             i,
             prefix,
-            analysis,
+            element_dimensions,
             options,
             visualise,
             object_names,
@@ -234,7 +241,7 @@ def compute_ir(
 def _compute_integral_ir(
     form_data,
     form_index,
-    element_numbers,
+    element_dimensions,
     integral_names,
     options,
     visualise,
@@ -248,6 +255,24 @@ def _compute_integral_ir(
         "custom": "cell",
     }
 
+    # The coefficient and constant data only depend on the form, so
+    # build them once and share them between all integrals of the form
+
+    # TODO: See if coefficient_numbering can be removed
+    # Build coefficient numbering for UFC interface here, to avoid
+    # renumbering in UFL and application of replace mapping
+    coefficient_numbering = {f: i for i, f in enumerate(form_data.reduced_coefficients)}
+
+    # Coefficient offsets, by number of cells an integral is restricted to
+    coefficient_offsets: dict[int, dict[ufl.Coefficient, int]] = {}
+
+    # Build offsets for Constants
+    original_constant_offsets = {}
+    _offset = 0
+    for constant in form_data.original_form.constants():
+        original_constant_offsets[constant] = _offset
+        _offset += np.prod(constant.ufl_shape, dtype=int)
+
     # Iterate over groups of integrals
     irs = []
     for itg_data_index, itg_data in enumerate(form_data.integral_data):
@@ -272,12 +297,6 @@ def _compute_integral_ir(
             "enabled_coefficients": itg_data.enabled_coefficients,
         }
 
-        # Get element space dimensions
-        unique_elements = element_numbers.keys()
-        element_dimensions = {
-            element: element.dim + element.num_global_support_dofs for element in unique_elements
-        }
-
         # Create dimensions of primary indices, needed to reset the argument
         # 'A' given to tabulate_tensor() by the assembler.
         argument_dimensions = [
@@ -377,33 +396,22 @@ def _compute_integral_ir(
                 )
                 sorted_integrals[cell_type][rule] = integral_new
 
-        # TODO: See if coefficient_numbering can be removed
-        # Build coefficient numbering for UFC interface here, to avoid
-        # renumbering in UFL and application of replace mapping
-        coefficient_numbering = {}
-        for i, f in enumerate(form_data.reduced_coefficients):
-            coefficient_numbering[f] = i
-
         # Add coefficient numbering to IR
         expression_ir["coefficient_numbering"] = coefficient_numbering
 
-        index_to_coeff = sorted([(v, k) for k, v in coefficient_numbering.items()])
-        offsets = {}
+        # Coefficients are numbered in order, so offsets can be computed
+        # directly from the reduced coefficients
         width = 2 if integral_type in ("interior_facet") else 1
-        _offset = 0
-        for k, el in zip(index_to_coeff, form_data.coefficient_elements):
-            offsets[k[1]] = _offset
-            _offset += width * element_dimensions[el]
+        if width not in coefficient_offsets:
+            offsets = {}
+            _offset = 0
+            for f, el in zip(form_data.reduced_coefficients, form_data.coefficient_elements):
+                offsets[f] = _offset
+                _offset += width * element_dimensions[el]
+            coefficient_offsets[width] = offsets
 
         # Copy offsets also into IR
-        expression_ir["coefficient_offsets"] = offsets
-
-        # Build offsets for Constants
-        original_constant_offsets = {}
-        _offset = 0
-        for constant in form_data.original_form.constants():
-            original_constant_offsets[constant] = _offset
-            _offset += np.prod(constant.ufl_shape, dtype=int)
+        expression_ir["coefficient_offsets"] = coefficient_offsets[width]
 
         expression_ir["original_constant_offsets"] = original_constant_offsets
 
@@ -508,7 +516,7 @@ def _compute_expression_ir(
     expr,
     index,
     prefix,
-    analysis,
+    element_dimensions,
     options,
     visualise,
     object_names,
@@ -534,13 +542,6 @@ def _compute_expression_ir(
         # without any dependencies
         cell = None
 
-    # Prepare dimensions of all unique element in expression, including
-    # elements for arguments, coefficients and coordinate mappings
-    element_dimensions = {
-        element: element.dim + element.num_global_support_dofs
-        for element in analysis.unique_elements
-    }
-
     # Extract dimensions for elements of arguments only
     arguments = ufl.algorithms.extract_arguments(expr)
     argument_elements = tuple(f.ufl_function_space().ufl_element() for f in arguments)
@@ -552,9 +553,7 @@ def _compute_expression_ir(
     base_ir["shape"] = list(expr.ufl_shape)
 
     coefficients = ufl.algorithms.extract_coefficients(expr)
-    coefficient_numbering = {}
-    for i, coeff in enumerate(coefficients):
-        coefficient_numbering[coeff] = i
+    coefficient_numbering = {coeff: i for i, coeff in enumerate(coefficients)}
 
     # Add coefficient numbering to IR
     base_ir["coefficient_numbering"] = coefficient_numbering
@@ -0,0 +1,88 @@
+# Copyright (C) 2026 FEniCS Project
+#
+# This file is part of FFCx. (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+import basix.ufl
+import numpy as np
+import pytest
+import ufl
+
+from ffcx.ir.elementtables import (
+    get_ffcx_table_values,
+    permute_quadrature_interval,
+    permute_quadrature_quadrilateral,
+    permute_quadrature_triangle,
+)
+
+
+def test_permute_interval():
+    points = np.array([[0.1], [0.25], [0.7]])
+    assert np.allclose(permute_quadrature_interval(points, 1), 1 - points)
+    assert np.allclose(permute_quadrature_interval(points, 2), points)
+
+
+@pytest.mark.parametrize(
+    "permute, nrot",
+    [(permute_quadrature_triangle, 3), (permute_quadrature_quadrilateral, 4)],
+)
+def test_permute_2d(permute, nrot):
+    points = np.array([[0.1, 0.2], [0.25, 0.6], [0.7, 0.05]])
+
+    # Reflecting swaps the coordinates
+    assert np.allclose(permute(points, 1, 0), points[:, ::-1])
+
+    # Rotating the reference facet all the way round is the identity
+    assert np.allclose(permute(points, 0, nrot), points)
+    assert np.allclose(permute(points, 2, nrot), points)
+
+    # Each permutation moves the points
+    for rot in range(nrot):
+        for ref in range(2):
+            if rot > 0 or ref > 0:
+                assert not np.allclose(permute(points, ref, rot), points)
+
+    # The input is left untouched
+    assert np.allclose(points[0], [0.1, 0.2])
+
+
+def test_permute_triangle_rotation():
+    points = np.array([[0.1, 0.2]])
+    assert np.allclose(permute_quadrature_triangle(points, 0, 1), [[0.2, 0.7]])
+
+
+def test_cell_averaged_table():
+    points = np.array([[0.1, 0.2], [0.3, 0.3], [0.2, 0.5], [0.6, 0.1]])
+    weights = np.array([0.1, 0.2, 0.2, 0.5])
+    element = basix.ufl.quadrature_element(
+        "triangle", points=points, weights=weights, value_shape=()
+    )
+    t = get_ffcx_table_values(
+        points, ufl.triangle, "cell", element, "cell", "cell", (0, 0), None, 0
+    )
+    # Each quadrature point dof is averaged with its weight
+    assert t["array"].shape == (1, 1, 1, 4)
+    assert np.allclose(t["array"][0, 0, 0], weights / weights.sum())
+
+
+def test_averaged_p2_table():
+    element = basix.ufl.element("P", "triangle", 2)
+
+    # The P2 vertex basis functions have zero mean on the cell and the
+    # edge basis functions have mean 1/3
+    t = get_ffcx_table_values(None, ufl.triangle, "cell", element, "cell", "cell", (0, 0), 0, 0)
+    assert t["array"].shape == (1, 1, 1, 6)
+    assert np.allclose(t["array"][0, 0, 0], [0, 0, 0, 1 / 3, 1 / 3, 1 / 3])
+
+    # On each facet the two vertex basis functions of the facet have mean
+    # 1/6 and the edge basis function of the facet has mean 2/3
+    t = get_ffcx_table_values(
+        None, ufl.triangle, "exterior_facet", element, "facet", "facet", (0, 0), 0, 0
+    )
+    assert t["array"].shape == (1, 3, 1, 6)
+    for facet in range(3):
+        expected = np.zeros(6)
+        expected[[v for v in range(3) if v != facet]] = 1 / 6
+        expected[3 + facet] = 2 / 3
+        assert np.allclose(t["array"][0, facet, 0], expected)